@@ -35,6 +35,7 @@ def expand_macros(circuit, preserve_definitions=False):
 class MacroExpander(Visitor):
     def __init__(self, preserve_definitions=False):
         self.preserve_definitions = preserve_definitions
+        self.expansions = {}
 
     def visit_default(self, obj):
         """By default we leave all objects alone. Note that the object is not
@@ -46,6 +47,7 @@ class MacroExpander(Visitor):
         gates."""
 
         self.macros = circuit.macros
+        self.expansions = {}
         new_circuit = Circuit(native_gates=circuit.native_gates)
         if self.preserve_definitions:
             new_circuit.macros.update(circuit.macros)
@@ -71,7 +73,23 @@ class MacroExpander(Visitor):
         return BlockStatement(parallel=block.parallel, statements=new_statements)
 
     def visit_GateStatement(self, gate):
-        return replace_gate(gate, self.macros)
+        if gate.name not in self.macros:
+            return gate
+
+        # Macro bodies are pure, so every call with the same arguments expands to
+        # the same statements, which can then be shared. The types are part of
+        # the key so that, e.g., 1 and 1.0 are not conflated.
+        key = (gate.name, tuple((type(v), v) for v in gate.parameters.values()))
+        try:
+            return self.expansions[key]
+        except KeyError:
+            pass
+        except TypeError:
+            # Unhashable arguments; these can't be memoized.
+            return replace_gate(gate, self.macros)
+
+        expansion = self.expansions[key] = replace_gate(gate, self.macros)
+        return expansion
 
 
 def replace_gate(gate, macros):
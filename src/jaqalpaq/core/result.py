@@ -3,6 +3,7 @@
 # certain rights in this software.
 import warnings
 from collections import OrderedDict
+from functools import lru_cache
 
 from .algorithm import fill_in_let, expand_macros
 from .algorithm.walkers import *
@@ -48,6 +49,19 @@ class ExecutionResult:
         time-ordered measurements and auxiliary data."""
         return self._readouts
 
+    @property
+    def readouts_as_int(self):
+        """The time-ordered measurement results as an array of integers, each with
+        qubit 0 represented by the least significant bit."""
+        # Don't require numpy in the experiment
+        import numpy
+
+        return numpy.fromiter(
+            (readout.as_int for readout in self._readouts),
+            dtype=numpy.int64,
+            count=len(self._readouts),
+        )
+
     @property
     def subcircuits(self):
         """An indexable, iterable view of the :class:`Subcircuit` objects, in
@@ -145,9 +159,7 @@ class RelativeFrequencySubcircuit(Subcircuit):
         dictionary mapping result strings to their respective probabilities."""
         qubits = len(self._trace.used_qubits)
         rf = self._relative_frequencies
-        return OrderedDict(
-            [(f"{n:b}".zfill(qubits)[::-1], v) for n, v in enumerate(rf)]
-        )
+        return OrderedDict(zip(_outcome_strings(qubits), rf))
 
     @property
     def probability_by_int(self):
@@ -256,7 +268,7 @@ class ProbabilisticSubcircuit(Subcircuit):
         dictionary mapping result strings to their respective probabilities."""
         qubits = len(self._trace.used_qubits)
         p = self._probabilities
-        return OrderedDict([(f"{n:b}".zfill(qubits)[::-1], v) for n, v in enumerate(p)])
+        return OrderedDict(zip(_outcome_strings(qubits), p))
 
     @property
     def probability_by_int(self):
@@ -309,6 +321,35 @@ class OutputParser(TraceVisitor):
         self.readout_index += 1
 
 
+#: (internal) The largest number of qubits whose result strings are memoized.
+_MAX_CACHED_OUTCOME_QUBITS = 12
+
+
+def _outcome_strings(qubits):
+    """(internal) Return every result string of a measurement of the given number of
+    qubits, ordered by its integer representation, with the first character
+    representing qubit 0.
+
+    Only those of small registers are kept; the strings of larger ones would hold on
+    to 2**qubits strings for the life of the process.
+    """
+    if qubits <= _MAX_CACHED_OUTCOME_QUBITS:
+        return _cached_outcome_strings(qubits)
+    return _format_outcome_strings(qubits)
+
+
+@lru_cache(maxsize=None)
+def _cached_outcome_strings(qubits):
+    """(internal) Memoized _outcome_strings, for at most _MAX_CACHED_OUTCOME_QUBITS
+    qubits."""
+    return tuple(_format_outcome_strings(qubits))
+
+
+def _format_outcome_strings(qubits):
+    """(internal) Generate the result strings returned by _outcome_strings."""
+    return (f"{n:b}".zfill(qubits)[::-1] for n in range(2**qubits))
+
+
 __all__ = [
     "ExecutionResult",
     "parse_jaqal_output_list",
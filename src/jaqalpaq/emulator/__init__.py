@@ -8,5 +8,6 @@ __all__ = [
     "run_jaqal_string",
     "run_jaqal_file",
     "run_jaqal_circuit",
+    "run_jaqal_circuit_batch",
     "UnitarySerializedEmulator",
 ]
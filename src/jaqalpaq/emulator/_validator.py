@@ -8,7 +8,7 @@ import numpy as np
 from jaqalpaq.error import JaqalError
 from jaqalpaq.parser import JaqalParseError, parse_jaqal_string
 
-from .frontend import run_jaqal_circuit
+from .frontend import run_jaqal_circuit, run_jaqal_circuit_batch
 
 
 def assertAlmostEqual(a, b):
@@ -199,7 +199,38 @@ def validate_jaqal_circuit(circ, expected, **kwargs):
         return ["raised expected exception"]
 
     exe = run_jaqal_circuit(circ, **kwargs)
+    return validate_jaqal_execution(exe, expected)
 
+
+def validate_jaqal_circuit_batch(circ, expected, backends):
+    """[undocumented] validate a Jaqal program on several backends at once
+
+    :param circ: a Jaqal circuit
+    :param expected: a dictionary produced by parse_jaqal_validation
+    :param backends: the backends to pass to run_jaqal_circuit_batch
+    :return: a list, one entry per backend, of the validations performed
+
+    """
+    if "error" in expected:
+        return [
+            validate_jaqal_circuit(circ, expected, backend=backend)
+            for backend in backends
+        ]
+
+    return [
+        validate_jaqal_execution(exe, expected)
+        for exe in run_jaqal_circuit_batch(circ, backends)
+    ]
+
+
+def validate_jaqal_execution(exe, expected):
+    """[undocumented] validate the results of executing a Jaqal program
+
+    :param exe: the ExecutionResult object to validate
+    :param expected: a dictionary produced by parse_jaqal_validation
+    :return: a list of validations performed
+
+    """
     validated = []
     if "true_str_list" in expected:
         true_str_list = expected["true_str_list"]
@@ -180,6 +180,12 @@ class IndependentSubcircuitsEmulatorWalker(TraceVisitor):
 class IndependentSubcircuitsJob(AbstractJob):
     """Job for circuit with subcircuits that are independent"""
 
+    def __init__(self, backend, circuit):
+        super().__init__(backend, circuit)
+        # Backends may store the outcome of each distinct subcircuit here, so that
+        # identical subcircuits are only computed once per job.
+        self.subcircuit_cache = {}
+
     def execute(self):
         w = IndependentSubcircuitsEmulatorWalker(self.traces, self.subcircuits)
         w.visit(self.circuit)
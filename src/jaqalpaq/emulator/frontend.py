@@ -1,10 +1,16 @@
 # Copyright 2020 National Technology & Engineering Solutions of Sandia, LLC (NTESS).
 # Under the terms of Contract DE-NA0003525 with NTESS, the U.S. Government retains
 # certain rights in this software.
-from jaqalpaq.run import run_jaqal_string, run_jaqal_file, run_jaqal_circuit
+from jaqalpaq.run import (
+    run_jaqal_string,
+    run_jaqal_file,
+    run_jaqal_circuit,
+    run_jaqal_circuit_batch,
+)
 
 __all__ = [
     "run_jaqal_string",
     "run_jaqal_file",
     "run_jaqal_circuit",
+    "run_jaqal_circuit_batch",
 ]
@@ -65,12 +65,24 @@ class CircuitEmulator(IndependentSubcircuitsBackend):
         )
 
         model = self.model
-        mfs = ModelFreeformSimulator(None)
-        rho, prob_dict = mfs.compute_final_state(model, pc, include_probabilities=True)
 
-        probs = zeros(len(prob_dict), dtype=float)
-        for k, v in prob_dict.items():
-            probs[int(k[::-1], 2)] = v
+        # Subcircuits that serialize to the same pyGSTi circuit (e.g., the same
+        # prepare/measure block repeated in a loop) have the same outcome; only
+        # simulate each distinct one once per job.
+        simulated = job.subcircuit_cache
+        try:
+            rho, probs = simulated[pc]
+        except KeyError:
+            mfs = ModelFreeformSimulator(None)
+            rho, prob_dict = mfs.compute_final_state(
+                model, pc, include_probabilities=True
+            )
+
+            probs = zeros(len(prob_dict), dtype=float)
+            for k, v in prob_dict.items():
+                probs[int(k[::-1], 2)] = v
+
+            simulated[pc] = rho, probs
 
         return pyGSTiSubcircuit(
             trace,
@@ -200,6 +200,12 @@ def build_noiseless_native_model(n_qubits, gates, evotype="statevec"):
     :param evotype: the pyGSTi evolution type to use for the model.  The default is
         "statevec", which is sufficient for noiseless simulation.
     :return: a pyGSTi noise model object
+
+    .. note::
+        This model is for comparing against noisy pyGSTi models.  Noiseless
+        emulation on its own is much faster with
+        :class:`~jaqalpaq.emulator.UnitarySerializedEmulator`, which contracts each
+        gate with the state vector rather than assembling full-size matrices.
     """
     pspec, gatedict = build_processor_spec(n_qubits, gates, evotype=evotype)
 
@@ -214,7 +220,10 @@ def build_noiseless_native_model(n_qubits, gates, evotype="statevec"):
     if evotype == "statevec":
         import warnings
 
-        warnings.warn('Setting sim="matrix".  Emulation will be SLOW.')
+        warnings.warn(
+            'Setting sim="matrix".  Emulation will be SLOW; consider '
+            "UnitarySerializedEmulator for noiseless emulation."
+        )
         target_model.sim = "matrix"
 
     return target_model
@@ -31,6 +31,19 @@ class UnitarySerializedEmulator(IndependentSubcircuitsBackend):
     This object should be treated as an opaque symbol to be passed to run_jaqal_circuit.
     """
 
+    def __init__(self, fuse_gates=True, dtype=complex):
+        """Create a new emulator.
+
+        :param bool fuse_gates: (default True) Multiply together consecutive
+          single-qubit gates acting on the same qubit, and apply their product to
+          the state vector once, rather than applying each gate separately.
+        :param dtype: (default complex) The complex dtype of the state vector and
+          the gate unitaries applied to it.  numpy.complex64 halves the memory
+          traffic, at the cost of only single-precision results.
+        """
+        self.fuse_gates = fuse_gates
+        self.dtype = dtype
+
     def _make_subcircuit(self, job, index, trace):
         """Generate the ProbabilisticSubcircuit associated with the trace of circuit
             being process in job.
@@ -44,19 +57,49 @@ class UnitarySerializedEmulator(IndependentSubcircuitsBackend):
         circ = job.circuit
         n_qubits = self.get_n_qubits(circ)
 
-        hilb_dim = 2**n_qubits
         gatedefs = circ.native_gates
 
-        # vec = U * inp
-        # We don't need to initialize inp yet
-        inp = numpy.empty(hilb_dim, dtype=complex)
-        vec = numpy.zeros(hilb_dim, dtype=complex)
-        vec[0] = 1
-
         # We serialize the subcircuit, obtaining a list of gates.
+        gates = list(TraceSerializer(trace).visit(circ))
+
+        # Subcircuits that call the same gates with the same arguments (e.g., the
+        # same prepare/measure block written out in several places) have the same
+        # outcome; only emulate each distinct one once per job.
+        emulated = job.subcircuit_cache
+        key = tuple((gate.name, tuple(gate.parameters.values())) for gate in gates)
+        try:
+            vec, probs = emulated[key]
+        except KeyError:
+            vec, probs = emulated[key] = self._emulate_gates(gates, gatedefs, n_qubits)
+        except TypeError:
+            # Unhashable arguments; these can't be memoized.
+            vec, probs = self._emulate_gates(gates, gatedefs, n_qubits)
+
+        subcircuit = EmulatorSubcircuit(
+            trace, index, probabilities=probs, state_vector=vec
+        )
+
+        return subcircuit
+
+    def _emulate_gates(self, gates, gatedefs, n_qubits):
+        """Apply a serialized list of gates to the all-zero state.
+
+        :param gates: the serialized gates of a subcircuit
+        :param gatedefs: the native gate definitions of the circuit
+        :param int n_qubits: the number of qubits to emulate
+        :return: the final state vector and the probabilities of each outcome
+        """
+
+        # Until a gate creates a superposition, keep only the one nonzero amplitude.
+        vec = _BasisState(0, 1, self.dtype)
+
+        # Products of single-qubit gates not yet applied to vec, keyed by qubit.
+        # Gates on distinct qubits commute, so these only need to be applied
+        # before another gate acts on the same qubit.
+        pending = {}
+
         # The plan is to apply the associated unitary to vec for each gate.
-        s = TraceSerializer(trace)
-        for gate in s.visit(circ):
+        for gate in gates:
             # This captures the classical arguments to the gate
             argv = []
             # This capture the quantum arguments to the gate --- the qubit index
@@ -73,80 +116,159 @@ class UnitarySerializedEmulator(IndependentSubcircuitsBackend):
                     qind.append(val.alias_index)
 
             # This is the dense submatrix
-            dsub = gatedef.ideal_unitary(*argv)
-
-            # now we need to sparse-multiply:
-            # vec = U * imp
-            # But! U isn't just dsub
+            dsub = numpy.asarray(gatedef.ideal_unitary(*argv), dtype=self.dtype)
 
-            # The current state-vector becomes the input to the matrix multiplication
-            inp, vec = vec, inp
-            # (Notice that this initializes inp, from above)
-            vec[:] = 0
-
-            # For every column in the output matrix, we need to compute the sum
-            # over the nonzero rows of U.
-
-            # However, this corresponds to a sum only over rows of dsub, with
-            # a particular mapping between the rows and columns.
-            for i in range(hilb_dim):
-                # Because we are only dealing with qubits, the binary representation
-                # of the row is precisely the standard basis label corresponding to that
-                # row.
-
-                # We need to re-map the qubits that are being acted on by dsub to
-                # the *column* of dsub.  Additionally, the qubits that are not being
-                # acted on by dsub are unaffected, and therefore are the same in both
-                # the input and output.
+            if self.fuse_gates and len(qind) == 1:
+                (q,) = qind
+                if q in pending:
+                    dsub = numpy.dot(dsub, pending[q])
+                pending[q] = dsub
+                continue
 
-                # mask is precisely these bystander qubits --- the affected qubits are
-                # set to zero, and shuffled into another variable, dsub_row
-                mask = i
+            flush = {q: pending.pop(q) for q in qind if q in pending}
+            vec = _apply_single_qubit_unitaries(vec, flush, n_qubits)
 
-                # We initialize dsub_row to zero, and then build it up via bit-twiddling
-                dsub_row = 0
+            vec = _apply_unitary(vec, dsub, qind, n_qubits)
 
-                # Which bit (stored as a bitmask) is up to be changed?
-                dsub_bit = 1
-                for i_k in qind:
-                    # We iterate over all the qubits acted on by dsub
+        vec = _apply_single_qubit_unitaries(vec, pending, n_qubits)
+        if isinstance(vec, _BasisState):
+            vec = vec.to_dense(n_qubits)
 
-                    # Is this specific qubit high (for this row)?
-                    n_high = mask & (1 << i_k)
+        probs = numpy.abs(vec) ** 2
+        if probs.dtype != float:
+            # Renormalize away the rounding error of a lower-precision state vector,
+            # which ProbabilisticSubcircuit would otherwise warn about.
+            probs = probs.astype(float)
+            probs /= probs.sum()
 
-                    # If it is high, lower it in the mask
-                    # (notice this is equivalent to subtraction)
-                    mask ^= n_high
+        return vec, probs
 
-                    # If it is high, raise it in the row to be passed to dsub
-                    # (notice this is equivalent to addition)
-                    if n_high:
-                        dsub_row |= dsub_bit
 
-                    # Advance the bit mask by one
-                    dsub_bit <<= 1
+class _BasisState:
+    """(internal) A state vector that is a multiple of a single standard basis state.
 
-                # We now have the row in dsub that corresponds to the row in U
+    :param int index: the index of the basis state, with qubit 0 as the least
+        significant bit
+    :param amplitude: the amplitude of that basis state
+    :param dtype: the dtype of the dense state vector
+    """
 
-                # Next, we need to iterate over the column of U, and simultaneously the
-                # column of inp --- this mapping is the same as the above, backwards.
-                for dsub_col in range(dsub.shape[0]):
-                    j = mask
-                    dsub_bit = 1
-                    for j_k in qind:
-                        if dsub_col & dsub_bit:
-                            j |= 1 << j_k
-                        dsub_bit <<= 1
+    def __init__(self, index, amplitude, dtype):
+        self.index = index
+        self.amplitude = amplitude
+        self.dtype = dtype
 
-                    # Suitably armed with the associated row and column, we
-                    # do the standard matrix accumulation sum step.
+    def to_dense(self, n_qubits):
+        """Return the state vector of all n_qubits qubits."""
+        vec = numpy.zeros(2**n_qubits, dtype=self.dtype)
+        vec[self.index] = self.amplitude
+        return vec
 
-                    vec[i] += inp[j] * dsub[dsub_row, dsub_col]
 
-        probs = numpy.abs(vec) ** 2
+def _apply_unitary(vec, dsub, qind, n_qubits):
+    """Apply the dense unitary dsub, acting on the qubits in qind, to vec.
 
-        subcircuit = EmulatorSubcircuit(
-            trace, index, probabilities=probs, state_vector=vec
-        )
-
-        return subcircuit
+    :param vec: the state vector of all n_qubits qubits, or a _BasisState
+    :param dsub: the unitary of the gate, with qind[0] as its least significant bit
+    :param qind: the indices of the qubits acted on by dsub
+    :param int n_qubits: the number of qubits in vec
+    :return: the new state vector
+    """
+    if isinstance(vec, _BasisState):
+        vec = vec.to_dense(n_qubits)
+
+    # Because we are only dealing with qubits, the binary representation of an
+    # index into vec is precisely the standard basis label for that entry.
+    # Reshaping vec into one axis of length 2 per qubit therefore gives each
+    # qubit its own axis, with qubit k on axis n_qubits - 1 - k (the most
+    # significant bit varies slowest).  The same holds for the rows and columns
+    # of dsub, whose qubit k is qind[k].
+    n_gate = len(qind)
+    psi = vec.reshape((2,) * n_qubits)
+    dsub = dsub.reshape((2,) * (2 * n_gate))
+
+    # Axes of psi acted on by the gate, in the order of the columns of dsub.
+    axes = [n_qubits - 1 - qind[n_gate - 1 - a] for a in range(n_gate)]
+
+    # Contracting the columns of dsub with those axes sums over the input basis
+    # states; the bystander qubits are unaffected, and are carried along as the
+    # trailing axes of the result.
+    psi = numpy.tensordot(dsub, psi, axes=(list(range(n_gate, 2 * n_gate)), axes))
+
+    # The rows of dsub are now the leading axes; put them back in place.
+    return numpy.moveaxis(psi, range(n_gate), axes).reshape(-1)
+
+
+def _apply_single_qubit_unitaries(vec, unitaries, n_qubits):
+    """Apply single-qubit unitaries, each acting on a different qubit, to vec.
+
+    Those that are a phase times a Pauli X, Z, or ZX are applied together, by a
+    single permutation and sign flip of vec; the rest are applied one at a time.
+
+    :param vec: the state vector of all n_qubits qubits, or a _BasisState
+    :param dict unitaries: maps each qubit index to the 2x2 unitary acting on it
+    :param int n_qubits: the number of qubits in vec
+    :return: the new state vector, which is a _BasisState if vec was and every
+        unitary is of the form above
+    """
+    phase = 1
+    x_mask = 0
+    z_qubits = []
+    for q, dsub in unitaries.items():
+        form = _pauli_form(dsub)
+        if form is None:
+            vec = _apply_unitary(vec, dsub, [q], n_qubits)
+            continue
+        p, x, z = form
+        phase *= p
+        x_mask |= x << q
+        if z:
+            z_qubits.append(q)
+
+    if not (x_mask or z_qubits or phase != 1):
+        return vec
+
+    if isinstance(vec, _BasisState):
+        # These gates map basis states to basis states; only follow the one.
+        index = vec.index ^ x_mask
+        if sum((index >> q) & 1 for q in z_qubits) % 2:
+            phase = -phase
+        return _BasisState(index, vec.amplitude * phase, vec.dtype)
+
+    # Flipping qubit q of a basis state is the same as flipping bit q of its index,
+    # so the X part sends the amplitude of index i ^ x_mask to index i.  The Z
+    # part, applied after it, then negates those entries whose index has odd
+    # parity on the Z qubits.
+    idx = numpy.arange(len(vec))
+    vec = vec[idx ^ x_mask] if x_mask else vec.copy()
+    if z_qubits:
+        parity = numpy.zeros(len(vec), dtype=bool)
+        for q in z_qubits:
+            parity ^= ((idx >> q) & 1).astype(bool)
+        vec[parity] *= -1
+    if phase != 1:
+        vec *= phase
+    return vec
+
+
+def _pauli_form(dsub):
+    """Describe a 2x2 unitary that is a phase times I, X, Z, or ZX.
+
+    :param dsub: a 2x2 unitary
+    :return: (phase, x, z), where x and z are 1 if the X (resp. Z) factor is
+        present and 0 otherwise, or None if dsub is not of that form
+    """
+    # Allow the rounding error of computing, e.g., cos(pi / 2) in dsub's precision.
+    atol = 8 * numpy.finfo(dsub.dtype).eps
+    ((a, b), (c, d)) = dsub
+    if abs(b) <= atol and abs(c) <= atol:
+        if abs(a - d) <= atol:
+            return a, 0, 0
+        if abs(a + d) <= atol:
+            return a, 0, 1
+    elif abs(a) <= atol and abs(d) <= atol:
+        if abs(b - c) <= atol:
+            return b, 1, 0
+        if abs(b + c) <= atol:
+            return b, 1, 1
+    return None
@@ -1,11 +1,17 @@
 # Copyright 2020 National Technology & Engineering Solutions of Sandia, LLC (NTESS).
 # Under the terms of Contract DE-NA0003525 with NTESS, the U.S. Government retains
 # certain rights in this software.
-from .run import run_jaqal_circuit, run_jaqal_file, run_jaqal_string
+from .run import (
+    run_jaqal_circuit,
+    run_jaqal_circuit_batch,
+    run_jaqal_file,
+    run_jaqal_string,
+)
 
 
 __all__ = [
     "run_jaqal_circuit",
+    "run_jaqal_circuit_batch",
     "run_jaqal_file",
     "run_jaqal_string",
 ]
@@ -49,22 +49,38 @@ def run_jaqal_circuit(circuit, backend=None, force_sim=False, emulator_backend=N
     elif runner_type != "emulator":
         raise JaqalError("Internal error: unknown runner")
 
-    if emulator_backend is not None:
-        import warnings
+    backend = _get_backend(backend, emulator_backend)
 
-        warnings.warn("emulator_backend is deprecated, please use backend instead.")
+    expanded = expand_macros(fill_in_let(expand_subcircuits(circuit)))
+    return backend(expanded).execute()
 
-        if backend is not None:
-            raise JaqalError("backend and emulator_backend cannot both be set!")
-        backend = emulator_backend
 
-    if backend is None:
-        from jaqalpaq.emulator.unitary import UnitarySerializedEmulator
+def run_jaqal_circuit_batch(circuit, backends, force_sim=False):
+    """Execute a Jaqal :class:`~jaqalpaq.core.Circuit` on several backends,
+    expanding its macros, let constants and subcircuits only once.
 
-        backend = UnitarySerializedEmulator()
+    :param Circuit circuit: The Jaqalpaq circuit to be run.
+    :param backends: The backends to perform the circuit simulation/emulation,
+        in order.  An entry of None selects UnitarySerializedEmulator.
+    :param force_sim: Unconditionally do not use the IPC.
+
+    :return: One result per backend, in the same order as backends.
+    :rtype: list of ExecutionResult
+
+    .. note::
+        See :meth:`run_jaqal_circuit` for the behavior of each execution.
+
+    """
+    runner_type, runner_port = _get_runner()
+    if runner_type != "emulator" and not force_sim:
+        return [run_jaqal_circuit(circuit, backend=backend) for backend in backends]
 
     expanded = expand_macros(fill_in_let(expand_subcircuits(circuit)))
-    return backend(expanded).execute()
+
+    results = []
+    for backend in backends:
+        results.append(_get_backend(backend)(expanded).execute())
+    return results
 
 
 def run_jaqal_string(jaqal, import_path=None, **kwargs):
@@ -106,6 +122,26 @@ def run_jaqal_file(fname, import_path=None, **kwargs):
     )
 
 
+def _get_backend(backend, emulator_backend=None):
+    """Return the backend to emulate a circuit with, given the backend and the
+    deprecated emulator_backend arguments of run_jaqal_circuit."""
+    if emulator_backend is not None:
+        import warnings
+
+        warnings.warn("emulator_backend is deprecated, please use backend instead.")
+
+        if backend is not None:
+            raise JaqalError("backend and emulator_backend cannot both be set!")
+        backend = emulator_backend
+
+    if backend is None:
+        from jaqalpaq.emulator.unitary import UnitarySerializedEmulator
+
+        backend = UnitarySerializedEmulator()
+
+    return backend
+
+
 def _get_runner():
     """Return whether we should use the emulator or ipc, and if the
     latter, what port to use."""
@@ -83,6 +83,19 @@ class ExpandMacrosTester(unittest.TestCase):
         exp_text = "register q[3]; g q[2]"
         self.run_test(text, exp_text)
 
+    def test_repeated_calls(self):
+        """Test expanding the same macro several times, with both repeated and
+        differing arguments."""
+        text = (
+            "register q[2]; macro foo a b { g a ; h b }; "
+            "foo q[0] 1; foo q[1] 1; foo q[0] 1; foo q[0] 1.5"
+        )
+        exp_text = (
+            "register q[2]; "
+            "g q[0] ; h 1 ; g q[1] ; h 1 ; g q[0] ; h 1 ; g q[0] ; h 1.5"
+        )
+        self.run_test(text, exp_text)
+
     def run_test(self, text, exp_text):
         act_parsed = parse_jaqal_string(text, autoload_pulses=False)
         act_circuit = expand_macros(act_parsed)
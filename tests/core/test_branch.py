@@ -1,4 +1,5 @@
 import unittest
+from unittest import mock
 import itertools
 
 import jaqalpaq.core.branch
@@ -9,10 +10,11 @@ class JaqalBranchTester(unittest.TestCase):
     """Test that a branch statement object behaves as expected."""
 
     def setUp(self):
-        jaqalpaq.core.branch.USE_EXPERIMENTAL_BRANCH = True
-
-    def tearDown(self):
-        jaqalpaq.core.branch.USE_EXPERIMENTAL_BRANCH = False
+        patcher = mock.patch.object(
+            jaqalpaq.core.branch, "USE_EXPERIMENTAL_BRANCH", True
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
 
     def test_create_branch(self):
         branch, body_count, case_statements = common.make_random_branch_statement(
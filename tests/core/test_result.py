@@ -0,0 +1,28 @@
+import unittest
+
+from jaqalpaq.core.result import _outcome_strings, _MAX_CACHED_OUTCOME_QUBITS
+
+
+class OutcomeStringsTester(unittest.TestCase):
+    def test_small_register(self):
+        """Test the result strings of a register whose strings are memoized."""
+        self.assertEqual(
+            list(_outcome_strings(3)),
+            ["000", "100", "010", "110", "001", "101", "011", "111"],
+        )
+        self.assertEqual(list(_outcome_strings(1)), ["0", "1"])
+
+    def test_large_register(self):
+        """Test the result strings of a register too large to be memoized."""
+        qubits = _MAX_CACHED_OUTCOME_QUBITS + 1
+        labels = list(_outcome_strings(qubits))
+        self.assertEqual(len(labels), 2**qubits)
+        self.assertEqual(labels[0], "0" * qubits)
+        self.assertEqual(labels[1], "1" + "0" * (qubits - 1))
+        self.assertEqual(labels[2], "01" + "0" * (qubits - 2))
+        self.assertEqual(labels[-1], "1" * qubits)
+        self.assertEqual(labels, list(_outcome_strings(qubits)))
+
+
+if __name__ == "__main__":
+    unittest.main()
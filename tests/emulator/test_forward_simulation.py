@@ -1,15 +1,21 @@
 import unittest, pytest
 import os
+import re
+from pathlib import Path
 
 import jaqalpaq
 import jaqalpaq.error
 from jaqalpaq.core.circuitbuilder import CircuitBuilder
 import numpy as np
-from jaqalpaq.emulator import run_jaqal_string, run_jaqal_circuit, run_jaqal_file
+from jaqalpaq.emulator import (
+    run_jaqal_string,
+    run_jaqal_circuit,
+    run_jaqal_file,
+    UnitarySerializedEmulator,
+)
 from jaqalpaq.generator import generate_jaqal_program
 import jaqalpaq.parser
 from jaqalpaq.core.result import ExecutionResult, parse_jaqal_output_list
-from collections import OrderedDict
 from jaqalpaq.emulator._validator import (
     generate_jaqal_validation,
     validate_jaqal_string,
@@ -21,14 +27,123 @@ qscout = pytest.importorskip("qscout")
 from qscout.v1.std import jaqal_gates
 from qscout.v1.std.noisy import SNLToy1
 
+_ALL_GATES = jaqal_gates.ALL_GATES
+
+_COMMENT_LINE_RE = re.compile(r"^//.*\n?", re.MULTILINE)
+
 
 def example(*args):
     return os.path.join("examples", "jaqal", *args)
 
 
+# Expected probabilities are indexed by the integer encoding of each outcome, with
+# qubit 0 as the least significant bit (as in probability_by_int).
+_MS_PROBS = np.array([0.5, 0, 0, 0.5, 0, 0, 0, 0])
+
+_BELL_PROBS = np.array([0.5, 0, 0, 0.5])
+
+_GHZ5_PROBS = np.zeros(2**5)
+_GHZ5_PROBS[[0b00000, 0b11111]] = 0.5
+
+# The single-qubit gate set tomography program from the Jaqal specification
+_GST_JAQAL = """
+from qscout.v1.std usepulses *
+
+register q[1]
+
+macro F0 qubit { }  // Fiducials
+macro F1 qubit { Sx qubit }
+macro F2 qubit { Sy qubit }
+macro F3 qubit { Sx qubit; Sx qubit}
+macro F4 qubit { Sx qubit; Sx qubit; Sx qubit }
+macro F5 qubit { Sy qubit; Sy qubit; Sy qubit }
+
+macro G0 qubit { Sx qubit }  // Germs
+macro G1 qubit { Sy qubit }
+macro G2 qubit { I_Sx qubit }
+macro G3 qubit { Sx qubit; Sy qubit }
+macro G4 qubit { Sx qubit; Sy qubit; I_Sx qubit }
+macro G5 qubit { Sx qubit; I_Sx qubit; Sy qubit }
+macro G6 qubit { Sx qubit; I_Sx qubit; I_Sx qubit }
+macro G7 qubit { Sy qubit; I_Sx qubit; I_Sx qubit }
+macro G8 qubit { Sx qubit; Sx qubit; I_Sx qubit; Sy qubit }
+macro G9 qubit { Sx qubit; Sy qubit; Sy qubit; I_Sx qubit }
+macro G10 qubit { Sx qubit; Sx qubit; Sy qubit; Sx qubit; Sy qubit; Sy qubit }
+
+prepare_all  // Length 1
+F0 q[0]
+measure_all
+
+prepare_all
+F1 q[0]
+measure_all
+
+prepare_all
+F2 q[0]
+measure_all
+
+prepare_all
+F3 q[0]
+measure_all
+
+prepare_all
+F4 q[0]
+measure_all
+
+prepare_all
+F5 q[0]
+measure_all
+
+prepare_all
+F1 q[0]; F1 q[0]
+measure_all
+
+prepare_all
+F1 q[0]; F2 q[0]
+measure_all
+
+prepare_all
+F1 q[0]
+loop 8 { G1 q[0] }
+F1 q[0]
+measure_all
+"""
+
+# Outcome probabilities of each subcircuit of the single-qubit GST program
+_GST_PROBS = np.array(
+    [
+        [1.0, 0.0],
+        [0.5, 0.5],
+        [0.5, 0.5],
+        [0.0, 1.0],
+        [0.5, 0.5],
+        [0.5, 0.5],
+        [0.0, 1.0],
+        [0.5, 0.5],
+        [0.0, 1.0],
+    ]
+)
+
+# Outcome probabilities of each subcircuit of the pi-fractions program
+_PI_FRACS_PROBS = np.array(
+    [
+        [0.9975923633363278, 0.0024076366636721458],
+        [0.9903926402064304, 0.009607359793569742],
+        [0.978470167862337, 0.02152983213766301],
+        [0.9619397662553992, 0.03806023374460075],
+    ]
+)
+
+
+def _readout_values(readouts):
+    """Extract the string and integer forms of readouts in a single pass."""
+    return tuple(zip(*((o.as_str, o.as_int) for o in readouts)))
+
+
 class ForwardSimulatorTester(unittest.TestCase):
-    def setUp(self):
-        builder = CircuitBuilder(jaqal_gates.ALL_GATES)
+    @classmethod
+    def setUpClass(cls):
+        builder = CircuitBuilder(_ALL_GATES)
 
         pi2 = builder.let("pi2", np.pi / 2)
         q = builder.register("q", 3)
@@ -37,18 +152,17 @@ class ForwardSimulatorTester(unittest.TestCase):
         builder.gate("MS", q[1], q[0], pi2, pi2)
         builder.gate("measure_all")
 
-        self.c = builder.build()
+        cls.c = builder.build()
 
-        self.jaqal_string = generate_jaqal_program(self.c)
+        cls.jaqal_string = generate_jaqal_program(cls.c)
 
-        self.jaqal_c = jaqalpaq.parser.parse_jaqal_string(
-            self.jaqal_string,
-            inject_pulses=jaqal_gates.ALL_GATES,
+        cls.jaqal_c = jaqalpaq.parser.parse_jaqal_string(
+            cls.jaqal_string, inject_pulses=_ALL_GATES
         )
 
     def test_generate_jaqal_program(self):
         self.assertEqual(
-            "\n".join([p for p in self.jaqal_string.split("\n")]),
+            self.jaqal_string,
             """let pi2 1.5707963267948966
 
 register q[3]
@@ -60,23 +174,28 @@ measure_all
         )
 
     def test_forward_simulate_circuit(self):
-        for c in [self.c, self.jaqal_c]:
-            res = run_jaqal_string(
-                "\n".join(("from qscout.v1.std usepulses *", self.jaqal_string))
-            )
+        res_string = run_jaqal_string(
+            "\n".join(("from qscout.v1.std usepulses *", self.jaqal_string))
+        )
+        res_circuit = run_jaqal_circuit(self.jaqal_c)
+
+        for res in (res_string, res_circuit):
+            for probs in (
+                res.subcircuits[0].probability_by_int,
+                res.subcircuits[0].simulated_probability_by_int,
+            ):
+                np.testing.assert_allclose(probs, _MS_PROBS, atol=1e-7)
 
             for c_dict in (
                 res.subcircuits[0].probability_by_str,
                 res.subcircuits[0].simulated_probability_by_str,
             ):
+                self.assertEqual(
+                    list(c_dict),
+                    ["000", "100", "010", "110", "001", "101", "011", "111"],
+                )
                 self.assertAlmostEqual(c_dict["000"], 0.5)
-                self.assertAlmostEqual(c_dict["001"], 0)
-                self.assertAlmostEqual(c_dict["010"], 0)
-                self.assertAlmostEqual(c_dict["011"], 0)
-                self.assertAlmostEqual(c_dict["100"], 0)
-                self.assertAlmostEqual(c_dict["101"], 0)
                 self.assertAlmostEqual(c_dict["110"], 0.5)
-                self.assertAlmostEqual(c_dict["111"], 0)
 
     def test_emulate_subcircuit(self):
         jaqal_string = """let pi2 1.5707963267948966
@@ -91,15 +210,8 @@ subcircuit {
             "\n".join(("from qscout.v1.std usepulses *", jaqal_string))
         )
 
-        c_dict = res.subcircuits[0].probability_by_str
-        self.assertAlmostEqual(c_dict["000"], 0.5)
-        self.assertAlmostEqual(c_dict["001"], 0)
-        self.assertAlmostEqual(c_dict["010"], 0)
-        self.assertAlmostEqual(c_dict["011"], 0)
-        self.assertAlmostEqual(c_dict["100"], 0)
-        self.assertAlmostEqual(c_dict["101"], 0)
-        self.assertAlmostEqual(c_dict["110"], 0.5)
-        self.assertAlmostEqual(c_dict["111"], 0)
+        probs = res.subcircuits[0].probability_by_int
+        np.testing.assert_allclose(probs, _MS_PROBS, atol=1e-7)
 
     def test_five_qubit_GHZ(self):
         jaqal_text = """
@@ -128,9 +240,11 @@ CNOT q[3] q[4]
 measure_all
 """
         jaqal_prog = jaqalpaq.parser.parse_jaqal_string(
-            jaqal_text, inject_pulses=jaqal_gates.ALL_GATES
+            jaqal_text, inject_pulses=_ALL_GATES
         )
         res = run_jaqal_circuit(jaqal_prog)
+        output_probs = res.subcircuits[0].probability_by_int
+        np.testing.assert_allclose(output_probs, _GHZ5_PROBS, atol=1e-7)
         output_probs = res.subcircuits[0].probability_by_str
         self.assertAlmostEqual(output_probs["00000"], 0.5)
         self.assertAlmostEqual(output_probs["11111"], 0.5)
@@ -145,7 +259,9 @@ Px q[0]
 measure_all
 measure_all
 """
-            jaqal_circ = jaqalpaq.parser.parse_jaqal_string(jaqal_str)
+            jaqal_circ = jaqalpaq.parser.parse_jaqal_string(
+                jaqal_str, autoload_pulses=True
+            )
             results = jaqalpaq.emulator.run_jaqal_circuit(jaqal_circ)
 
     def test_spec_bell_state(self):
@@ -173,93 +289,72 @@ hadamard q[0]
 cnot q[0] q[1]
 measure_all
 """
-        results = jaqalpaq.emulator.run_jaqal_string(jaqal_str)
-        probs = results.subcircuits[0].probability_by_str
-        true_probs = OrderedDict({"00": 0.5, "01": 0, "10": 0, "11": 0.5})
-        for key in true_probs:
-            self.assertAlmostEqual(probs[key], true_probs[key])
+        results = run_jaqal_string(jaqal_str)
+        probs = results.subcircuits[0].probability_by_int
+        np.testing.assert_allclose(probs, _BELL_PROBS, atol=1e-7)
 
-    def test_spec_single_qubit_gst(self):
+    def test_fused_gates(self):
         jaqal_str = """
 from qscout.v1.std usepulses *
 
-register q[1]
-
-macro F0 qubit { }  // Fiducials
-macro F1 qubit { Sx qubit }
-macro F2 qubit { Sy qubit }
-macro F3 qubit { Sx qubit; Sx qubit}
-macro F4 qubit { Sx qubit; Sx qubit; Sx qubit }
-macro F5 qubit { Sy qubit; Sy qubit; Sy qubit }
-
-macro G0 qubit { Sx qubit }  // Germs
-macro G1 qubit { Sy qubit }
-macro G2 qubit { I_Sx qubit }
-macro G3 qubit { Sx qubit; Sy qubit }
-macro G4 qubit { Sx qubit; Sy qubit; I_Sx qubit }
-macro G5 qubit { Sx qubit; I_Sx qubit; Sy qubit }
-macro G6 qubit { Sx qubit; I_Sx qubit; I_Sx qubit }
-macro G7 qubit { Sy qubit; I_Sx qubit; I_Sx qubit }
-macro G8 qubit { Sx qubit; Sx qubit; I_Sx qubit; Sy qubit }
-macro G9 qubit { Sx qubit; Sy qubit; Sy qubit; I_Sx qubit }
-macro G10 qubit { Sx qubit; Sx qubit; Sy qubit; Sx qubit; Sy qubit; Sy qubit }
-
-prepare_all  // Length 1
-F0 q[0]
-measure_all
-
-prepare_all
-F1 q[0]
-measure_all
-
-prepare_all
-F2 q[0]
-measure_all
-
-prepare_all
-F3 q[0]
-measure_all
-
-prepare_all
-F4 q[0]
-measure_all
+register q[3]
 
 prepare_all
-F5 q[0]
+Sx q[0]
+Sy q[0]
+Rz q[1] 0.3
+Sy q[1]
+MS q[0] q[1] 0 1.5707963267948966
+Sxd q[0]
+Px q[2]
+<Syd q[1] | Sy q[2]>
+R q[2] 0.2 0.7
+<Px q[0] | Py q[1] | Pz q[2]>
 measure_all
+"""
+        circ = jaqalpaq.parser.parse_jaqal_string(jaqal_str, inject_pulses=_ALL_GATES)
+        fused, unfused = (
+            run_jaqal_circuit(circ, backend=UnitarySerializedEmulator(fuse_gates))
+            for fuse_gates in (True, False)
+        )
+        np.testing.assert_allclose(
+            fused.subcircuits[0].state_vector,
+            unfused.subcircuits[0].state_vector,
+            atol=1e-12,
+        )
 
-prepare_all
-F1 q[0]; F1 q[0]
-measure_all
+    def test_fused_loops(self):
+        jaqal_str = """
+from qscout.v1.std usepulses *
 
-prepare_all
-F1 q[0]; F2 q[0]
-measure_all
+register q[2]
 
 prepare_all
-F1 q[0]
-loop 8 { G1 q[0] }
-F1 q[0]
+loop 8 { Sy q[0] }
+loop 2 { Sx q[1] }
 measure_all
 """
-        results = jaqalpaq.emulator.run_jaqal_string(jaqal_str)
-        prob_dicts = {
-            i: p.probability_by_str for i, p in enumerate(results.subcircuits)
-        }
-        true_prob_dicts = {
-            0: OrderedDict([("0", 1.0), ("1", 0.0)]),
-            1: OrderedDict([("0", 0.5), ("1", 0.5)]),
-            2: OrderedDict([("0", 0.5), ("1", 0.5)]),
-            3: OrderedDict([("0", 0), ("1", 1.0)]),
-            4: OrderedDict([("0", 0.5), ("1", 0.5)]),
-            5: OrderedDict([("0", 0.5), ("1", 0.5)]),
-            6: OrderedDict([("0", 0.0), ("1", 1.0)]),
-            7: OrderedDict([("0", 0.5), ("1", 0.5)]),
-            8: OrderedDict([("0", 0.0), ("1", 1.0)]),
-        }
-        for i in range(len(results.subcircuits)):
-            for key in true_prob_dicts[i].keys():
-                self.assertAlmostEqual(prob_dicts[i][key], true_prob_dicts[i][key])
+        # Sy^8 is the identity, and Sx^2 = Px = -iX.
+        results = run_jaqal_circuit(
+            jaqalpaq.parser.parse_jaqal_string(jaqal_str, inject_pulses=_ALL_GATES)
+        )
+        np.testing.assert_allclose(
+            results.subcircuits[0].state_vector, [0, 0, -1j, 0], atol=1e-12
+        )
+
+    def test_spec_single_qubit_gst(self):
+        results = run_jaqal_string(_GST_JAQAL)
+        actual = np.array([sc.probability_by_int for sc in results.subcircuits])
+        np.testing.assert_allclose(actual, _GST_PROBS, atol=1e-7)
+
+    def test_spec_single_qubit_gst_fp32(self):
+        backend = UnitarySerializedEmulator(dtype=np.complex64)
+        results = run_jaqal_circuit(
+            jaqalpaq.parser.parse_jaqal_string(_GST_JAQAL, inject_pulses=_ALL_GATES),
+            backend=backend,
+        )
+        actual = np.array([sc.probability_by_int for sc in results.subcircuits])
+        np.testing.assert_allclose(actual, _GST_PROBS, atol=1e-5)
 
     def test_bit_flip(self):
         jaqal_str = """
@@ -277,7 +372,7 @@ Px q[1]
     measure_all
 }
 """
-        results = jaqalpaq.emulator.run_jaqal_string(jaqal_str)
+        results = run_jaqal_string(jaqal_str)
         output = [o.as_str for o in results.readouts]
         true_output = ["10", "10", "01", "01"]
         self.assertEqual(output, true_output)
@@ -304,28 +399,68 @@ prepare_all
 Px q[2]
 measure_all
 """
-        results = jaqalpaq.emulator.run_jaqal_string(jaqal_str)
+        results = run_jaqal_string(jaqal_str)
         output = [o.as_str for o in results.readouts]
-        int_output = [o.as_int for o in results.readouts]
-        true_output = ["100", "010", "010", "100", "010", "010", "001"]
-        true_int_output = [1, 2, 2, 1, 2, 2, 4]
-        self.assertEqual(output, true_output)
-        self.assertEqual(int_output, true_int_output)
+        self.assertEqual(output, ["100", "010", "010", "100", "010", "010", "001"])
+        np.testing.assert_array_equal(results.readouts_as_int, [1, 2, 2, 1, 2, 2, 4])
 
-        int_output = [o.as_int for o in results.subcircuits[0].readouts]
-        output = [o.as_str for o in results.subcircuits[0].readouts]
-        self.assertEqual(int_output, [1, 1])
-        self.assertEqual(output, ["100", "100"])
+        true_subcircuit_outputs = [
+            (("100", "100"), (1, 1)),
+            (("010", "010", "010", "010"), (2, 2, 2, 2)),
+            (("001",), (4,)),
+        ]
+        self.assertEqual(len(results.subcircuits), len(true_subcircuit_outputs))
+        for sc, true_outputs in zip(results.subcircuits, true_subcircuit_outputs):
+            self.assertEqual(_readout_values(sc.readouts), true_outputs)
 
-        int_output = [o.as_int for o in results.subcircuits[1].readouts]
-        output = [o.as_str for o in results.subcircuits[1].readouts]
-        self.assertEqual(int_output, [2, 2, 2, 2])
-        self.assertEqual(output, ["010", "010", "010", "010"])
+    def check_repeated_subcircuits(self, backend):
+        """Check that identical subcircuits are computed once per job, but sampled
+        independently."""
+        jaqal_str = """
+from qscout.v1.std usepulses *
 
-        int_output = [o.as_int for o in results.subcircuits[2].readouts]
-        output = [o.as_str for o in results.subcircuits[2].readouts]
-        self.assertEqual(int_output, [4])
-        self.assertEqual(output, ["001"])
+register q[1]
+loop 40 {
+    prepare_all
+    Sx q[0]
+    measure_all
+}
+loop 40 {
+    prepare_all
+    Sx q[0]
+    measure_all
+}
+"""
+        circ = jaqalpaq.parser.parse_jaqal_string(jaqal_str, autoload_pulses=True)
+        job = backend(circ)
+        self.assertEqual(len(job.subcircuit_cache), 1)
+
+        results = job.execute()
+        first, second = results.subcircuits
+        np.testing.assert_array_equal(
+            first.simulated_probability_by_int, second.simulated_probability_by_int
+        )
+        np.testing.assert_allclose(
+            first.simulated_probability_by_int, [0.5, 0.5], atol=1e-7
+        )
+
+        self.assertEqual([o.index for o in first.readouts], list(range(40)))
+        self.assertEqual([o.index for o in second.readouts], list(range(40, 80)))
+        self.assertEqual(sum(first.relative_frequency_by_int), 40)
+        self.assertEqual(sum(second.relative_frequency_by_int), 40)
+        # Each subcircuit's readouts are sampled on their own; 40 matching fair coin
+        # flips would be a 2**-40 coincidence.
+        self.assertNotEqual(
+            [o.as_int for o in first.readouts], [o.as_int for o in second.readouts]
+        )
+
+    def test_repeated_subcircuits(self):
+        self.check_repeated_subcircuits(UnitarySerializedEmulator())
+
+    def test_repeated_subcircuits_pygsti(self):
+        self.check_repeated_subcircuits(
+            SNLToy1(1, depolarization=0, rotation_error=0, phase_error=0)
+        )
 
     def test_spec_pi_fracs(self):
         jaqal_str = """
@@ -351,19 +486,9 @@ Ry q[0] pi_8
 measure_all
 """
 
-        results = jaqalpaq.emulator.run_jaqal_string(jaqal_str)
-        prob_dicts = {
-            i: p.probability_by_str for i, p in enumerate(results.subcircuits)
-        }
-        true_prob_dicts = {
-            0: OrderedDict([("0", 0.9975923633363278), ("1", 0.0024076366636721458)]),
-            1: OrderedDict([("0", 0.9903926402064304), ("1", 0.009607359793569742)]),
-            2: OrderedDict([("0", 0.978470167862337), ("1", 0.02152983213766301)]),
-            3: OrderedDict([("0", 0.9619397662553992), ("1", 0.03806023374460075)]),
-        }
-        for i in range(len(results.subcircuits)):
-            for key in true_prob_dicts[i].keys():
-                self.assertAlmostEqual(prob_dicts[i][key], true_prob_dicts[i][key])
+        results = run_jaqal_string(jaqal_str)
+        actual = np.array([sc.probability_by_int for sc in results.subcircuits])
+        np.testing.assert_allclose(actual, _PI_FRACS_PROBS, atol=1e-7)
 
     def test_nested_bit_flips(self):
         jaqal_str = """
@@ -398,7 +523,10 @@ loop 2 {
             }
         }
 """
-        results = jaqalpaq.emulator.run_jaqal_string(jaqal_str)
+        parsed_jaqal_str = jaqalpaq.parser.parse_jaqal_string(
+            jaqal_str, autoload_pulses=True
+        )
+        results = run_jaqal_circuit(parsed_jaqal_str)
         output = [o.as_str for o in results.readouts]
         true_output = [
             "1000",
@@ -434,12 +562,10 @@ loop 2 {
         ]
         self.assertEqual(output, true_output)
 
-        parsed_jaqal_str = jaqalpaq.parser.parse_jaqal_string(jaqal_str)
-
         # We do not yet support reuse
         # exe_reuse = parse_jaqal_output_list(results._circuit, true_output)
         exe = parse_jaqal_output_list(parsed_jaqal_str, true_output)
-        self.assertEqual(true_output, [o.as_str for o in results.readouts])
+        self.assertEqual(true_output, output)
         self.assertEqual(true_output, [o.as_str for o in exe.readouts])
         # self.assertEqual(true_output, [o.as_str for o in exe_reuse.readouts])
 
@@ -448,11 +574,7 @@ loop 2 {
         exe = run_jaqal_file(fname)
         newval = generate_jaqal_validation(exe)
 
-        with open(fname, "r") as f:
-            txt = [a for a in f.readlines() if not a.startswith("//")]
-
-        txt.append(newval)
-        txt = "".join(txt)
+        txt = _COMMENT_LINE_RE.sub("", Path(fname).read_text()) + newval
 
         res = validate_jaqal_string(txt)
 
@@ -491,7 +613,7 @@ loop 2 {
         self.assertEqual(p_rx_id2.name, "Gidle")
         (rx_dur_1,) = p_rx_id1.args
         (rx_dur_2,) = p_rx_id2.args
-        self.assertAlmostEqual(rx_dur_1, rx_dur_2)
+        assert rx_dur_1 == pytest.approx(rx_dur_2)
 
         # Check that idles are performed on qubit 2 and 3 during Rx_stretched
         p_rx_stretched_id1 = pc[4]
@@ -500,10 +622,10 @@ loop 2 {
         self.assertEqual(p_rx_stretched_id2.name, "Gidle")
         (rx_stretched_dur_1,) = p_rx_stretched_id1.args
         (rx_stretched_dur_2,) = p_rx_stretched_id2.args
-        self.assertAlmostEqual(rx_stretched_dur_1, rx_stretched_dur_2)
+        assert rx_stretched_dur_1 == pytest.approx(rx_stretched_dur_2)
 
         # Check that the idle is of stretched duration
-        self.assertAlmostEqual(rx_stretched_dur_1, rx_dur_1 * 1.5)
+        assert rx_stretched_dur_1 == pytest.approx(rx_dur_1 * 1.5)
 
         # Check that an idle is performed on qubit 2 during MS
         p_ms_id = pc[7]
@@ -516,7 +638,7 @@ loop 2 {
         (ms_stretched_dur,) = p_ms_stretched_id.args
 
         # Check that the idle is of stretched duration
-        self.assertAlmostEqual(ms_dur * 3, ms_stretched_dur)
+        assert ms_dur * 3 == pytest.approx(ms_stretched_dur)
 
         # There should be no zero-length idles in parallel with the Rz
         self.assertEqual(len(pc), 11)
@@ -532,21 +654,26 @@ loop 2 {
         backends.KEEP_PYGSTI_OBJECTS = True
 
         try:
-            circ = jaqalpaq.parser.parse_jaqal_string(content)
+            circ = jaqalpaq.parser.parse_jaqal_string(content, autoload_pulses=True)
 
             backend = SNLToy1(3, rotation_error=0, depolarization=0.1)
             exe_res = run_jaqal_circuit(circ, backend=backend)
             sc = exe_res.subcircuits[0]
 
             probs = sc.probability_by_int
-            self.assertAlmostEqual(probs[0], 0.48055181)
-            self.assertAlmostEqual(probs[1], 0.16081769)
-            self.assertAlmostEqual(probs[2], 0.23973497)
-            self.assertAlmostEqual(probs[3], 0.08022782)
-            self.assertAlmostEqual(probs[4], 0.01932925)
-            self.assertAlmostEqual(probs[5], 0.00646858)
-            self.assertAlmostEqual(probs[6], 0.00964287)
-            self.assertAlmostEqual(probs[7], 0.00322701)
+            assert probs == pytest.approx(
+                [
+                    0.48055181,
+                    0.16081769,
+                    0.23973497,
+                    0.08022782,
+                    0.01932925,
+                    0.00646858,
+                    0.00964287,
+                    0.00322701,
+                ],
+                abs=1e-7,
+            )
 
             pc = sc._pygsti_circuit
             # This checks that there are three "layers" of pygsti gates.
@@ -595,14 +722,19 @@ loop 2 {
 
         from jaqalpaq.emulator.pygsti import backends
 
-        circ = jaqalpaq.parser.parse_jaqal_string(content)
+        circ = jaqalpaq.parser.parse_jaqal_string(content, autoload_pulses=True)
 
         backend = SNLToy1(2, rotation_error=0, depolarization=0.1)
         exe_res = run_jaqal_circuit(circ, backend=backend)
         sc = exe_res.subcircuits[0]
 
         probs = sc.probability_by_int
-        self.assertAlmostEqual(probs[0], 0.36710198608176264)
-        self.assertAlmostEqual(probs[1], 0.23878743128890134)
-        self.assertAlmostEqual(probs[2], 0.23878743128890134)
-        self.assertAlmostEqual(probs[3], 0.15532315134043467)
+        assert probs == pytest.approx(
+            [
+                0.36710198608176264,
+                0.23878743128890134,
+                0.23878743128890134,
+                0.15532315134043467,
+            ],
+            abs=1e-7,
+        )
@@ -5,7 +5,7 @@ import numpy as np
 
 from jaqalpaq.parser import parse_jaqal_string
 from jaqalpaq.emulator._validator import (
-    validate_jaqal_circuit,
+    validate_jaqal_circuit_batch,
     parse_jaqal_validation,
     validate_jaqal_parse,
 )
@@ -22,7 +22,8 @@ def example(*args):
     return os.path.join("examples", "jaqal", *args)
 
 
-_fnames = [example(fn) for fn in os.listdir(example()) if fn[-6:] == ".jaqal"]
+with os.scandir(example()) as entries:
+    _fnames = [example(e.name) for e in entries if e.name.endswith(".jaqal")]
 
 
 def pytest_generate_tests(metafunc):
@@ -42,48 +43,26 @@ class TestExecuteAnnotatedJaqalFile:
 
         circ = ret
 
-        validate_jaqal_circuit(circ, expected)
-
         (reg,) = circ.fundamental_registers()
         n = reg.size
 
-        backend = SNLToy1(
-            n,
-            depolarization=0,
-            rotation_error=0,
-            phase_error=0,
-        )
-
-        validate_jaqal_circuit(circ, expected, backend=backend)
-
-        validate_jaqal_circuit(
-            circ,
-            expected,
-            backend=CircuitEmulator(
-                model=build_noiseless_native_model(
-                    n, circ.native_gates, evotype="default"
-                ),
-                gate_durations=backend.gate_durations,
-            ),
-        )
-
-        backend = SNLToy1(
-            n,
-            depolarization=0,
-            rotation_error=0,
-            phase_error=0,
-            stretched_gates=1,
-        )
-
-        validate_jaqal_circuit(circ, expected, backend=backend)
-
-        validate_jaqal_circuit(
-            circ,
-            expected,
-            backend=CircuitEmulator(
-                model=build_noiseless_native_model(
-                    n, circ.native_gates, evotype="default"
-                ),
-                gate_durations=backend.gate_durations,
-            ),
-        )
+        backends = [None]
+        for stretched_gates in (None, 1):
+            backend = SNLToy1(
+                n,
+                depolarization=0,
+                rotation_error=0,
+                phase_error=0,
+                stretched_gates=stretched_gates,
+            )
+            backends.append(backend)
+            backends.append(
+                CircuitEmulator(
+                    model=build_noiseless_native_model(
+                        n, circ.native_gates, evotype="default"
+                    ),
+                    gate_durations=backend.gate_durations,
+                )
+            )
+
+        validate_jaqal_circuit_batch(circ, expected, backends)
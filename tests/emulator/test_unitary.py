@@ -0,0 +1,67 @@
+import unittest
+
+import numpy as np
+
+from jaqalpaq.emulator.unitary import _apply_unitary
+
+_I = np.eye(2)
+_X = np.array([[0, 1], [1, 0]])
+_P0 = np.diag([1, 0])
+_P1 = np.diag([0, 1])
+
+# CNOT with qind[1] (the most significant bit of the gate) as the control, and
+# qind[0] as the target.
+_CNOT = np.array([[1, 0, 0, 0], [0, 1, 0, 0], [0, 0, 0, 1], [0, 0, 1, 0]])
+
+
+def _embed(ops, n_qubits):
+    """Return the operator on n_qubits qubits applying ops[k] to qubit k, and the
+    identity to every qubit not in ops.  Qubit 0 is the least significant bit."""
+    full = np.eye(1)
+    for k in reversed(range(n_qubits)):
+        full = np.kron(full, ops.get(k, _I))
+    return full
+
+
+class ApplyUnitaryTester(unittest.TestCase):
+    def setUp(self):
+        self.random = np.random.default_rng(20201109)
+
+    def random_state(self, n_qubits):
+        vec = self.random.normal(size=2**n_qubits) + 1j * self.random.normal(
+            size=2**n_qubits
+        )
+        return vec / np.linalg.norm(vec)
+
+    def test_cnot(self):
+        """Test an asymmetric two-qubit gate on reversed and non-adjacent qubits."""
+        for n_qubits, target, control in [
+            (3, 0, 1),
+            (3, 1, 0),
+            (3, 0, 2),
+            (3, 2, 0),
+            (4, 1, 3),
+            (4, 3, 1),
+            (4, 3, 0),
+        ]:
+            with self.subTest(n_qubits=n_qubits, target=target, control=control):
+                expected_op = _embed({control: _P0}, n_qubits) + _embed(
+                    {control: _P1, target: _X}, n_qubits
+                )
+                vec = self.random_state(n_qubits)
+                actual = _apply_unitary(vec.copy(), _CNOT, (target, control), n_qubits)
+                np.testing.assert_allclose(actual, expected_op @ vec, atol=1e-12)
+
+    def test_cnot_basis_states(self):
+        """Test that a CNOT flips its target exactly when its control is set."""
+        n_qubits = 3
+        for index in range(2**n_qubits):
+            vec = np.zeros(2**n_qubits, dtype=complex)
+            vec[index] = 1
+            actual = _apply_unitary(vec, _CNOT, (0, 2), n_qubits)
+            expected = index ^ 1 if index & 4 else index
+            self.assertEqual(np.flatnonzero(actual).tolist(), [expected])
+
+
+if __name__ == "__main__":
+    unittest.main()
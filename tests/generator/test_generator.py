@@ -1,47 +1,45 @@
-from re import sub, DOTALL
+import re
 from unittest import TestCase
 
 from jaqalpaq.generator import generate_jaqal_program
 from jaqalpaq.parser import parse_jaqal_string
 
 
+_COMMENT_RE = re.compile(r"//[^\n]*|/\*.*\*/", re.DOTALL)
+_BLOCK_SEPARATORS = str.maketrans(
+    {
+        "\t": " ",
+        "|": "\n",
+        "<": "\n<\n",
+        ">": "\n>\n",
+        ";": "\n",
+        "{": "\n{\n",
+        "}": "\n}\n",
+    }
+)
+_TRAILING_ZEROS_RE = re.compile(r"(?<=[0-9])0+(?= |\n)")
+_SPACES_RE = re.compile(" +")
+
+
 class GeneratorTester(TestCase):
     def run_test(self, program):
         with open(program) as fd:
             self.run_test_string(fd.read())
 
     def normalize_jaqal(self, text):
-        # replace tabs
-        text = sub("\t", " ", text)
-
-        # remove comments
-        text = sub("//.*", "", text)
-        text = sub(r"/\*.*\*/", "", text, flags=DOTALL)
-
-        # expand parallel blocks
-        text = sub(r"\|", "\n", text)
-        text = sub("<", "\n<\n", text)
-        text = sub(">", "\n>\n", text)
-
-        # expand serial blocks
-        text = sub(";", "\n", text)
-        text = sub("{", "\n{\n", text)
-        text = sub("}", "\n}\n", text)
+        # remove comments, then expand parallel and serial blocks onto their
+        # own lines in a single pass
+        text = _COMMENT_RE.sub("", text).translate(_BLOCK_SEPARATORS)
 
         # drop zeros at the ends of numbers
-        text = sub("(?<=[0123456789])0+(?= |\n)", "\n", text)
-
-        # ignore register statements (ambiguous order in header)
-        text = sub("(^|\n) *register .*(\n|$)", "\n", text)
-
-        # remove repeated whitespace
-        text = sub(" +", " ", text)
-        text = sub(" *\n *", "\n", text)
-        text = sub("\n+", "\n", text)
-        text = sub("^( |\n)*", "", text)
-        text = sub("( |\n)*$", "", text)
-
-        return text
+        text = _TRAILING_ZEROS_RE.sub("\n", text)
+
+        # remove repeated whitespace and ignore register statements (ambiguous
+        # order in header)
+        lines = (_SPACES_RE.sub(" ", line).strip(" ") for line in text.split("\n"))
+        return "\n".join(
+            line for line in lines if line and not line.startswith("register ")
+        )
 
     def run_test_string(self, text):
         circuit1 = parse_jaqal_string(text, autoload_pulses=False)
@@ -1,38 +1,64 @@
-import socket, select, os
+import asyncio, os
 import json
 from jaqalpaq.emulator import run_jaqal_string
 
 BLOCK_SIZE = 4096  # size recommended by Python docs
-POLLING_TIMEOUT = 0.1
+POLLING_TIMEOUT = 0.01
+SOCKET_PATH = "/tmp/ipc_test"
 
-server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
-server.bind("/tmp/ipc_test")
-try:
-    server.listen(1)
-    conn, addr = server.accept()
 
-    resp_list = []
-    started = False
+async def read_request(reader):
+    # The client keeps its socket open between requests, so rather than waiting
+    # for EOF, wait for the first packet and then read until the client pauses.
+    resp_buf = bytearray(await reader.read(BLOCK_SIZE))
     while True:
-        events = select.select([conn], [], [conn], POLLING_TIMEOUT)
-        if any(events):
-            packet = conn.recv(BLOCK_SIZE)
-            if packet:
-                resp_list.append(packet.decode())
-                started = True
-                continue
-
-        if started:
+        try:
+            packet = await asyncio.wait_for(reader.read(BLOCK_SIZE), POLLING_TIMEOUT)
+        except asyncio.TimeoutError:
             break
-    resp_text = "".join(resp_list)
+        if not packet:
+            break
+        resp_buf += packet
+    # Decoding once at the end keeps multi-byte characters split across packets
+    # intact.
+    return resp_buf.decode()
+
+
+async def main():
+    done = asyncio.get_event_loop().create_future()
+
+    async def handle(reader, writer):
+        try:
+            resp_text = await read_request(reader)
+
+            # Unvalidated and unauthenticated network-received data is being passed
+            # to the Jaqal emulator here.
+            exe_res = run_jaqal_string(resp_text)
+
+            results = [
+                list(subcirc.probability_by_int) for subcirc in exe_res.subcircuits
+            ]
+
+            writer.write(json.dumps(results).encode())
+            await writer.drain()
+        except Exception as exc:
+            # Shut the server down with the error, rather than leaving the client
+            # waiting on a response that will never come.
+            if not done.done():
+                done.set_exception(exc)
+        finally:
+            writer.close()
+            if not done.done():
+                done.set_result(None)
 
-    # Unvalidated and unauthenticated network-received data is being passed to
-    # the Jaqal emulator here.
-    exe_res = run_jaqal_string(resp_text)
+    server = await asyncio.start_unix_server(handle, SOCKET_PATH)
+    try:
+        await done
+    finally:
+        server.close()
+        await server.wait_closed()
+        os.unlink(SOCKET_PATH)
 
-    results = [list(subcirc.probability_by_int) for subcirc in exe_res.subcircuits]
 
-    conn.send(json.dumps(results).encode())
-    server.close()
-finally:
-    os.unlink("/tmp/ipc_test")
+# Not asyncio.run, which needs Python 3.7
+asyncio.new_event_loop().run_until_complete(main())
@@ -14,9 +14,20 @@ class IPCTester(unittest.TestCase):
     def mock_server(self):
         P = subprocess.Popen([sys.executable, "-m", "tests.ipc._mock_server"])
 
-        time.sleep(1)
         ipc._host_socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
-        ipc._host_socket.connect("/tmp/ipc_test")
+        # Connect as soon as the server is listening rather than after a fixed
+        # delay; the server may take a while to import the emulator.
+        deadline = time.monotonic() + 10
+        delay = 0.01
+        while True:
+            try:
+                ipc._host_socket.connect("/tmp/ipc_test")
+                break
+            except (FileNotFoundError, ConnectionRefusedError):
+                if time.monotonic() > deadline:
+                    raise
+                time.sleep(delay)
+                delay = min(2 * delay, 0.2)
 
         try:
             yield
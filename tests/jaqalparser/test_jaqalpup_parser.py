@@ -1,5 +1,4 @@
-from unittest import TestCase
-from numbers import Number
+from unittest import TestCase, mock
 
 from jaqalpaq.core import (
     GateDefinition,
@@ -13,6 +12,7 @@ from jaqalpaq.core import (
     NamedQubit,
     AnnotatedValue,
 )
+import jaqalpaq.core.branch
 from jaqalpaq.core.branch import BranchStatement, CaseStatement
 from jaqalpaq.parser import parse_jaqal_string, JaqalParseError
 from jaqalpaq.parser.parser import parse_jaqal_string_header
@@ -20,7 +20,18 @@ from jaqalpaq.parser.identifier import Identifier
 from jaqalpaq.error import JaqalError
 
 
+def _circuit_fields(circuit):
+    """Return the parts of circuit that run_test compares."""
+    return (circuit.body, circuit.macros, circuit.constants, circuit.registers)
+
+
 class ParserTester(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        # Pay for the one-time parser setup (such as patching sly) before the
+        # first test, rather than inside it.
+        parse_jaqal_string("foo", autoload_pulses=False)
+
     def setUp(self):
         self.gate_definitions = {}
         self.registers = {}
@@ -58,9 +69,10 @@ class ParserTester(TestCase):
     def test_let_float(self):
         """Test a let constant that is a floating point value."""
         text = "let a 3.14; foo a"
+        a = self.make_constant("a", 3.14)
         exp_result = self.make_circuit(
-            constants={"a": self.make_constant("a", 3.14)},
-            gates=[self.make_gate("foo", self.make_constant("a", 3.14))],
+            constants={"a": a},
+            gates=[self.make_gate("foo", a)],
         )
         self.run_test(text, exp_result)
 
@@ -80,31 +92,34 @@ class ParserTester(TestCase):
     def test_let_as_register_index(self):
         """Test a let-constant used as a register index and not expanded."""
         text = "register r[3]; let a 1; foo r[a]"
+        a = self.make_constant("a", 1)
         exp_result = self.make_circuit(
             registers={"r": self.make_register("r", 3)},
-            constants={"a": self.make_constant("a", 1)},
-            gates=[self.make_gate("foo", ("r", self.make_constant("a", 1)))],
+            constants={"a": a},
+            gates=[self.make_gate("foo", ("r", a))],
         )
         self.run_test(text, exp_result)
 
     def test_let_as_map_index(self):
         """Test a let-constant used as a map index and not expanded."""
         text = "register r[3]; map q r; let a 1; foo q[a]"
+        a = self.make_constant("a", 1)
         exp_result = self.make_circuit(
             registers={"r": self.make_register("r", 3)},
             maps={"q": self.make_map("q", "r", None)},
-            constants={"a": self.make_constant("a", 1)},
-            gates=[self.make_gate("foo", ("q", self.make_constant("a", 1)))],
+            constants={"a": a},
+            gates=[self.make_gate("foo", ("q", a))],
         )
         self.run_test(text, exp_result)
 
     def test_let_as_map_range(self):
         """Test a let-constant used as an element in the slice defining a map that is not expanded."""
         text = "register r[3]; let a 1; map q r[a:]"
+        a = self.make_constant("a", 1)
         exp_result = self.make_circuit(
             registers={"r": self.make_register("r", 3)},
-            constants={"a": self.make_constant("a", 1)},
-            maps={"q": self.make_map("q", "r", (self.make_constant("a", 1), 3, 1))},
+            constants={"a": a},
+            maps={"q": self.make_map("q", "r", (a, 3, 1))},
             gates=[],
         )
         self.run_test(text, exp_result)
@@ -112,9 +127,10 @@ class ParserTester(TestCase):
     def test_let_in_register_size(self):
         """Test a let-constant used as the size of a register."""
         text = "let a 5; register r[a]"
+        a = self.make_constant("a", 5)
         exp_result = self.make_circuit(
-            constants={"a": self.make_constant("a", 5)},
-            registers={"r": self.make_register("r", self.make_constant("a", 5))},
+            constants={"a": a},
+            registers={"r": self.make_register("r", a)},
             gates=[],
         )
         self.run_test(text, exp_result)
@@ -282,9 +298,10 @@ class ParserTester(TestCase):
     def test_let_no_resolve(self):
         """Test parsing a let statement"""
         text = "let a 2; foo a"
+        a = self.make_constant("a", 2)
         exp_result = self.make_circuit(
-            gates=[self.make_gate("foo", self.make_constant("a", 2))],
-            constants={"a": self.make_constant("a", 2)},
+            gates=[self.make_gate("foo", a)],
+            constants={"a": a},
         )
         self.run_test(text, exp_result)
 
@@ -361,14 +378,15 @@ class ParserTester(TestCase):
     def test_no_expand_macro_let_map_leave_metadata(self):
         """Test an example that does not exercise all available options but involves features that could be."""
         text = "register r[3]; map q r; let a 2; macro foo x y { g x y }; foo q[a] 3.14"
+        a = self.make_constant("a", 2)
         exp_result = self.make_circuit(
             registers={"r": self.make_register("r", 3)},
             maps={"q": self.make_map("q", "r", None)},
-            constants={"a": self.make_constant("a", 2)},
+            constants={"a": a},
             macros={
                 "foo": self.make_macro("foo", ["x", "y"], self.make_gate("g", "x", "y"))
             },
-            gates=[self.make_gate("foo", ("q", self.make_constant("a", 2)), 3.14)],
+            gates=[self.make_gate("foo", ("q", a), 3.14)],
         )
         self.run_test(text, exp_result)
 
@@ -380,28 +398,25 @@ class ParserTester(TestCase):
         )
         self.assertEqual(act_value, exp_value)
 
+    # Patching the flag restores whatever value it had before, so the test leaves
+    # no trace on the other tests run by the same process.
+    @mock.patch.object(jaqalpaq.core.branch, "USE_EXPERIMENTAL_BRANCH", True)
     def test_branch_statement(self):
         """Test parsing a branch statement."""
-        import jaqalpaq.core.branch
-
-        jaqalpaq.core.branch.USE_EXPERIMENTAL_BRANCH = True
-        try:
-            text = "branch { \n'0': { foo }\n '1': { bar } \n }"
-            exp_result = self.make_circuit(
-                gates=[
-                    self.make_branch(
-                        self.make_case(
-                            0, self.make_sequential_gate_block(self.make_gate("foo"))
-                        ),
-                        self.make_case(
-                            1, self.make_sequential_gate_block(self.make_gate("bar"))
-                        ),
-                    )
-                ]
-            )
-            self.run_test(text, exp_result)
-        finally:
-            jaqalpaq.core.branch.USE_EXPERIMENTAL_BRANCH = False
+        text = "branch { \n'0': { foo }\n '1': { bar } \n }"
+        exp_result = self.make_circuit(
+            gates=[
+                self.make_branch(
+                    self.make_case(
+                        0, self.make_sequential_gate_block(self.make_gate("foo"))
+                    ),
+                    self.make_case(
+                        1, self.make_sequential_gate_block(self.make_gate("bar"))
+                    ),
+                )
+            ]
+        )
+        self.run_test(text, exp_result)
 
     def test_parse_header_only(self):
         """Test parsing only the header of a jaqal string."""
@@ -447,31 +462,34 @@ class ParserTester(TestCase):
             autoload_pulses=False,
         )
         if exp_result is not None:
-            self.assertEqual(exp_result.body, act_result.body)
-            self.assertEqual(exp_result.macros, act_result.macros)
-            self.assertEqual(exp_result.constants, act_result.constants)
-            self.assertEqual(exp_result.registers, act_result.registers)
+            # Compare all the fields at once, and only one at a time to report
+            # which of them differs.
+            if _circuit_fields(exp_result) != _circuit_fields(act_result):
+                self.assertEqual(exp_result.body, act_result.body)
+                self.assertEqual(exp_result.macros, act_result.macros)
+                self.assertEqual(exp_result.constants, act_result.constants)
+                self.assertEqual(exp_result.registers, act_result.registers)
         if exp_native_gates is not None:
             self.assertEqual(exp_native_gates, act_result.native_gates)
 
     @staticmethod
     def make_circuit(*, gates, registers=None, macros=None, constants=None, maps=None):
         circuit = Circuit()
-        for gate in gates:
-            circuit.body.statements.append(gate)
-        if registers:
-            circuit.registers.update(registers)
-        if macros:
-            circuit.macros.update(macros)
-        if constants:
-            circuit.constants.update(constants)
-        if maps:
-            circuit.registers.update(maps)
+        circuit.body.statements.extend(gates)
+        # Maps are stored alongside the registers they alias.
+        for table, entries in (
+            (circuit.registers, registers),
+            (circuit.macros, macros),
+            (circuit.constants, constants),
+            (circuit.registers, maps),
+        ):
+            if entries:
+                table.update(entries)
         return circuit
 
     def make_gate(self, name, *args, native_gates=None):
         """Make a gate that is either native or not. Don't call directly."""
-        arg_objects = [self.make_argument_object(arg) for arg in args]
+        arg_objects = list(map(self.make_argument_object, args))
         if native_gates:
             gate_def = self.get_native_gate_definition(name, native_gates)
         else:
@@ -483,12 +501,12 @@ class ParserTester(TestCase):
 
     def get_gate_definition(self, name, params):
         """Return an existing or create a new GateDefinition."""
-        if name not in self.gate_definitions:
+        try:
+            return self.gate_definitions[name]
+        except KeyError:
             gate_def = GateDefinition(name, params)
             self.gate_definitions[name] = gate_def
-        else:
-            gate_def = self.gate_definitions[name]
-        return gate_def
+            return gate_def
 
     @staticmethod
     def get_native_gate_definition(name, native_gates):
@@ -500,7 +518,7 @@ class ParserTester(TestCase):
 
     def make_argument_object(self, arg):
         """Format an argument as the GateStatement constructor expects it."""
-        if isinstance(arg, Number):
+        if isinstance(arg, (int, float)):
             return arg
         elif isinstance(arg, tuple):
             return self.make_qubit(*arg)
@@ -515,30 +533,34 @@ class ParserTester(TestCase):
 
     def make_qubit(self, name, index):
         """Return a NamedQubit object, possibly creating a register object in the process."""
-        if name not in self.registers:
-            raise ValueError(f"Please define register {name}")
-        else:
-            return self.registers[name][index]
+        try:
+            register = self.registers[name]
+        except KeyError:
+            raise ValueError(f"Please define register {name}") from None
+        return register[index]
 
     def make_parameter_from_arg(self, index, arg):
         """Define a Parameter from the argument to a gate. Used to define a new GateDefinition."""
-        param = self.make_parameter(index=index, kind=None)
-        return param
+        return self.make_parameter(index=index, kind=None)
 
-    def make_parameter(self, name=None, index=None, kind=None):
+    @staticmethod
+    def make_parameter(name=None, index=None, kind=None):
         if name is None:
             if index is None:
                 raise ValueError("Provide either name or index to Parameter")
             name = str(index)
         return Parameter(name, kind)
 
-    def make_parallel_gate_block(self, *gates):
+    @staticmethod
+    def make_parallel_gate_block(*gates):
         return BlockStatement(parallel=True, statements=list(gates))
 
-    def make_sequential_gate_block(self, *gates):
+    @staticmethod
+    def make_sequential_gate_block(*gates):
         return BlockStatement(parallel=False, statements=list(gates))
 
-    def make_subcircuit_gate_block(self, iterations, *gates):
+    @staticmethod
+    def make_subcircuit_gate_block(iterations, *gates):
         return BlockStatement(
             subcircuit=True, iterations=iterations, statements=list(gates)
         )
@@ -563,7 +585,8 @@ class ParserTester(TestCase):
             body=self.make_sequential_gate_block(*statements),
         )
 
-    def make_constant(self, name, value):
+    @staticmethod
+    def make_constant(name, value):
         return Constant(name, value)
 
     def make_map(self, name, reg_name, reg_indexing):
@@ -574,16 +597,22 @@ class ParserTester(TestCase):
                 raise ValueError(
                     f"reg_indexing must have 3 elements, found {len(reg_indexing)}"
                 )
-            reg_indexing = tuple(self.make_slice_component(arg) for arg in reg_indexing)
+            # Plain ints and Nones are already valid slice components.
+            if not all(arg is None or type(arg) is int for arg in reg_indexing):
+                reg_indexing = tuple(map(self.make_slice_component, reg_indexing))
             alias_slice = slice(*reg_indexing)
             reg = Register(
-                name, alias_from=self.registers[reg_name], alias_slice=alias_slice
+                name,
+                alias_from=self.registers[reg_name],
+                alias_slice=alias_slice,
             )
             self.registers[name] = reg
             return reg
         elif isinstance(reg_indexing, int):
             nq = NamedQubit(
-                name, alias_from=self.registers[reg_name], alias_index=reg_indexing
+                name,
+                alias_from=self.registers[reg_name],
+                alias_index=reg_indexing,
             )
             self.registers[name] = nq
             return nq
@@ -594,7 +623,8 @@ class ParserTester(TestCase):
         else:
             raise ValueError(f"Bad register indexing {reg_indexing}")
 
-    def make_slice_component(self, arg):
+    @staticmethod
+    def make_slice_component(arg):
         if isinstance(arg, int):
             return arg
         elif isinstance(arg, str):
@@ -608,18 +638,21 @@ class ParserTester(TestCase):
 
     def make_named_qubit(self, name):
         """Return a named qubit that is stored as a map in the registers."""
-        if name not in self.registers:
-            raise ValueError(f"No entity called {name}")
-        named_qubit = self.registers[name]
+        try:
+            named_qubit = self.registers[name]
+        except KeyError:
+            raise ValueError(f"No entity called {name}") from None
         if not isinstance(named_qubit, NamedQubit):
             raise TypeError(f"Register entry {name} not a named qubit")
         return named_qubit
 
-    def make_branch(self, *cases):
+    @staticmethod
+    def make_branch(*cases):
         """Return a BranchStatement with the given cases."""
         return BranchStatement(list(cases))
 
-    def make_case(self, state, block):
+    @staticmethod
+    def make_case(state, block):
         """Return a CaseStatement conditioned on the given state. The state is
         represented as a str of '1' and '0's."""
         return CaseStatement(state, block)
@@ -629,12 +662,10 @@ class ErrorMessageTester(TestCase):
     """Attempt to have uniform errors in parsing."""
 
     def test_unexpected_token_message(self):
-        try:
-            text = "register r[-1]"
+        text = "register r[-1]"
+        with self.assertRaises(JaqalParseError) as cm:
             parse_jaqal_string(text, autoload_pulses=False)
-            self.fail("No exception raised")
-        except JaqalParseError as exc:
-            # Lines and columns are 1-indexed
-            self.assertEqual(exc.line, 1)
-            # Column for this message is the start of the word "register"
-            self.assertEqual(exc.column, 1)
+        # Lines and columns are 1-indexed
+        self.assertEqual(cm.exception.line, 1)
+        # Column for this message is the start of the word "register"
+        self.assertEqual(cm.exception.column, 1)
@@ -1,11 +1,24 @@
 """Test that the grammar properly parses Jaqal"""
+import os
 import unittest
 import random
+import string
 
 from jaqalpaq.parser.parser import parse_to_sexpression
 from jaqalpaq.parser.identifier import Identifier
 from jaqalpaq.utilities import RESERVED_WORDS
 
+# The seed of the random programs HeaderParserTester parses.
+SEED = int(os.environ.get("JAQAL_PARSER_FUZZ_SEED", 20201109))
+# The number of random programs HeaderParserTester parses.
+ITERATIONS = int(os.environ.get("JAQAL_PARSER_FUZZ_ITERATIONS", 50))
+
+# RESERVED_WORDS is a list; make_identifier checks every candidate against it.
+_RESERVED_WORDS = frozenset(RESERVED_WORDS)
+
+FOO_ID = Identifier.parse("foo")
+RELATIVE_FOO_BAR_ID = Identifier.parse(".foo.bar")
+
 
 class ParserTester(unittest.TestCase):
     def test_comment(self):
@@ -52,12 +65,12 @@ class ParserTester(unittest.TestCase):
 
     def test_usepulses_all(self):
         text = "from foo usepulses *"
-        sexpr = ["circuit", ["usepulses", Identifier.parse("foo"), "*"]]
+        sexpr = ["circuit", ["usepulses", FOO_ID, "*"]]
         self.run_test(text, sexpr)
 
     def test_usepulses_relative(self):
         text = "from .foo.bar usepulses *"
-        sexpr = ["circuit", ["usepulses", Identifier.parse(".foo.bar"), "*"]]
+        sexpr = ["circuit", ["usepulses", RELATIVE_FOO_BAR_ID, "*"]]
         self.run_test(text, sexpr)
 
     def test_gate_no_args(self):
@@ -240,11 +253,11 @@ class ParserTester(unittest.TestCase):
         """Test a bunch of body statements together"""
         text = (
             "macro foo a b {\n"
-            + "g0 a\n"
-            + "g1 b\n"
-            + "}\n"
-            + "loop 5 < foo q r >\n"
-            + "x q[7]\n"
+            "g0 a\n"
+            "g1 b\n"
+            "}\n"
+            "loop 5 < foo q r >\n"
+            "x q[7]\n"
         )
         sexpr = [
             "circuit",
@@ -302,35 +315,40 @@ class ParserTester(unittest.TestCase):
 class HeaderParserTester(unittest.TestCase):
     """Test parsing just the header from a file."""
 
+    def setUp(self):
+        # A fixed seed makes any failure reproducible.
+        self.random = random.Random(SEED)
+
     def test_parsing_header(self):
         """Test parsing a header of zero or more statements followed by a body
         of zero or more statements."""
-        header_text, header_sexpr = self.make_header()
-        body_text, _ = self.make_body()
-        text = header_text + body_text
-        sexpr = ["circuit"] + header_sexpr
-        self.run_test(text, sexpr)
+        for _ in range(ITERATIONS):
+            header_text, header_sexpr = self.make_header()
+            body_text, _ = self.make_body()
+            text = header_text + body_text
+            sexpr = ["circuit"] + header_sexpr
+            self.run_test(text, sexpr)
 
     def make_header(self):
         """Return a header as text and an expected s-expression"""
-        text = ""
+        lines = []
         sexpr = []
         count = self.make_statement_count()
         for _ in range(count):
             stmt_text, stmt_sexpr = self.make_header_statement()
-            text = text + stmt_text + "\n"
+            lines.append(stmt_text + "\n")
             sexpr.append(stmt_sexpr)
-        return text, sexpr
+        return "".join(lines), sexpr
 
     def make_statement_count(self):
-        if random.uniform(0, 1) < 0.5:
+        if self.random.uniform(0, 1) < 0.5:
             return 0
         else:
-            return random.randint(1, 5)
+            return self.random.randint(1, 5)
 
     def make_header_statement(self):
         """Return a random header statement."""
-        func = random.choice(
+        func = self.random.choice(
             [
                 self.make_let_statement,
                 self.make_register_statement,
@@ -370,7 +388,7 @@ class HeaderParserTester(unittest.TestCase):
         module = self.make_identifier()
         filename = self.make_identifier()
         text = f"from {module}.{filename} usepulses *"
-        sexpr = ["usepulses", Identifier.parse(f"{module}.{filename}"), "*"]
+        sexpr = ["usepulses", Identifier((module, filename)), "*"]
         return text, sexpr
 
     def make_identifier(self):
@@ -378,42 +396,39 @@ class HeaderParserTester(unittest.TestCase):
         # This is a subset of possible identifiers since that's not
         # really what we're testing here.
         while True:
-            count = random.randint(1, 8)
-            letters = random.choices(
-                [chr(c) for c in range(ord("a"), ord("z") + 1)], k=count
-            )
-            ident = "".join(letters)
-            if ident not in RESERVED_WORDS:
+            count = self.random.randint(1, 8)
+            ident = "".join(self.random.choices(string.ascii_lowercase, k=count))
+            if ident not in _RESERVED_WORDS:
                 return ident
 
     def make_number(self):
         """Return a random number, either an integer or float."""
-        select = random.uniform(0, 1)
+        select = self.random.uniform(0, 1)
         if select < 0.5:
-            return random.randint(-100, 100)
+            return self.random.randint(-100, 100)
         elif select < 0.6:
-            return float(random.randint(-100, 100))
+            return float(self.random.randint(-100, 100))
         else:
             return self.make_float()
 
     def make_integer(self):
-        return random.randint(1, 100)
+        return self.random.randint(1, 100)
 
     def make_float(self):
-        return random.uniform(-100, 100)
+        return self.random.uniform(-100, 100)
 
     def make_body(self):
-        text = ""
+        lines = []
         sexpr = []
         count = self.make_statement_count()
         for _ in range(count):
             stmt_text, stmt_sexpr = self.make_body_statement()
-            text = text + stmt_text + "\n"
+            lines.append(stmt_text + "\n")
             sexpr.append(stmt_sexpr)
-        return text, sexpr
+        return "".join(lines), sexpr
 
     def make_body_statement(self):
-        func = random.choice(
+        func = self.random.choice(
             [
                 self.make_gate,
                 self.make_macro,
@@ -426,32 +441,35 @@ class HeaderParserTester(unittest.TestCase):
 
     def make_gate(self):
         """Make a random gate."""
-        arg_count = random.randint(0, 4)
+        arg_count = self.random.randint(0, 4)
         name = self.make_identifier()
         args = [self.make_gate_arg() for _ in range(arg_count)]
-        text = f'{name} {" ".join(str(arg) for arg in args)}'
-        sexpr = ["gate", name, *args]
+        text = f'{name} {" ".join(arg_text for _, arg_text in args)}'
+        sexpr = ["gate", name, *(arg for arg, _ in args)]
         return text, sexpr
 
     def make_gate_arg(self):
-        if random.uniform(0, 1) < 0.5:
-            return self.make_identifier()
+        """Return a random gate argument and how it is written."""
+        if self.random.uniform(0, 1) < 0.5:
+            ident = self.make_identifier()
+            return ident, ident
         else:
-            return self.make_number()
+            num = self.make_number()
+            return num, str(num)
 
     def make_macro(self):
         """Make a random macro definition."""
-        param_count = random.randint(0, 4)
+        param_count = self.random.randint(0, 4)
         name = self.make_identifier()
         params = [self.make_identifier() for _ in range(param_count)]
         block_text, block_sexpr = self.make_sequential_block()
-        param_string = " ".join(str(param) for param in params)
+        param_string = " ".join(params)
         text = f"macro {name} {param_string} {block_text}"
         sexpr = ["macro", name, *params, block_sexpr]
         return text, sexpr
 
     def make_sequential_block(self):
-        gate_count = random.randint(0, 4)
+        gate_count = self.random.randint(0, 4)
         gates = [self.make_gate() for _ in range(gate_count)]
         gate_string = ";".join(g[0] for g in gates)
         text = f"{{ {gate_string} }}"
@@ -459,7 +477,7 @@ class HeaderParserTester(unittest.TestCase):
         return text, sexpr
 
     def make_parallel_block(self):
-        gate_count = random.randint(0, 4)
+        gate_count = self.random.randint(0, 4)
         gates = [self.make_gate() for _ in range(gate_count)]
         gate_string = "|".join(g[0] for g in gates)
         text = f"< {gate_string} >"
@@ -467,7 +485,7 @@ class HeaderParserTester(unittest.TestCase):
         return text, sexpr
 
     def make_loop(self):
-        count = random.randint(0, 10)
+        count = self.random.randint(0, 10)
         block_text, block_sexpr = self.make_sequential_block()
         text = f"loop {count} {block_text}"
         sexpr = ["loop", count, block_sexpr]
@@ -475,7 +493,11 @@ class HeaderParserTester(unittest.TestCase):
 
     def run_test(self, text, exp_sexpr):
         act_sexpr = parse_to_sexpression(text, header_only=True)
-        self.assertEqual(exp_sexpr, act_sexpr)
+        self.assertEqual(
+            exp_sexpr,
+            act_sexpr,
+            f"Parsing {text!r} (rerun with JAQAL_PARSER_FUZZ_SEED={SEED})",
+        )
 
 
 if __name__ == "__main__":
@@ -1,19 +1,34 @@
+"""Test that Qsyntax builds the same circuits as the equivalent Jaqal.
+
+QsyntaxTester enables experimental branches for the whole class, in
+setUpClass. Its tests share no other state, so pytest-xdist may spread them
+across worker processes; each worker runs setUpClass for its share.
+"""
 import unittest
+from unittest import mock
 
 from jaqalpaq.qsyntax import circuit
 from jaqalpaq.parser import parse_jaqal_string
-import jaqalpaq.core.branch
+from jaqalpaq.core import branch
 
 
 class QsyntaxTester(unittest.TestCase):
     """Test generating code using Qsyntax and ensuring it creates the
     expected IR."""
 
-    def setUp(self):
-        jaqalpaq.core.branch.USE_EXPERIMENTAL_BRANCH = True
+    @classmethod
+    def setUpClass(cls):
+        # Pay for the one-time parser setup before the first test rather than
+        # inside it.
+        parse_jaqal_string("prepare_all; measure_all", autoload_pulses=False)
+
+        # Every test may use branches; enable them once for the whole class.
+        cls._branch_patcher = mock.patch.object(branch, "USE_EXPERIMENTAL_BRANCH", True)
+        cls._branch_patcher.start()
 
-    def tearDown(self):
-        jaqalpaq.core.branch.USE_EXPERIMENTAL_BRANCH = False
+    @classmethod
+    def tearDownClass(cls):
+        cls._branch_patcher.stop()
 
     def test_empty_circuit(self):
         """Test an empty circuit, which really contains an implicit